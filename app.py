@@ -1,10 +1,11 @@
 from flask import Flask, render_template, request, redirect, url_for, flash, g
 from flask_login import LoginManager, UserMixin, login_user, login_required, logout_user, current_user
 import mysql.connector
-import bcrypt
+from mysql.connector import pooling
 from dotenv import load_dotenv
 import os
 import random
+import threading
 from datetime import datetime, timedelta
 
 # Load environment variables
@@ -13,21 +14,53 @@ load_dotenv()
 app = Flask(__name__)
 app.secret_key = os.getenv('FLASK_KEY')
 
+DB_CONFIG = {
+    'host': os.getenv('MYSQL_HOST'),
+    'user': os.getenv('MYSQL_USER'),
+    'password': os.getenv('MYSQL_PWD'),
+    'database': os.getenv('MYSQL_SCHEMA'),
+    'autocommit': True,     # mysql.connector py library will open connections with autocommit OFF by default
+}
+# The pool opens every connection up front. A sync gunicorn worker handles one
+# request at a time, so one connection per worker (per thread) is enough.
+DB_POOL_SIZE = min(max(int(os.getenv('MYSQL_POOL_SIZE', '1')), 1), pooling.CNX_POOL_MAXSIZE)
+
 # Setup Flask-Login
 login_manager = LoginManager()
 login_manager.init_app(app)
 login_manager.login_view = 'login'
 
-# MySQL connection per request
+# MySQL connection pool, one per process.
+# The pool is created lazily and keyed on the process id: when gunicorn runs with
+# --preload and forks workers, each worker builds its own pool instead of sharing
+# sockets inherited from the master.
+_db_pool = None
+_db_pool_pid = None
+_db_pool_lock = threading.Lock()    # threaded workers must not each build a pool
+
+def get_db_pool():
+    global _db_pool, _db_pool_pid
+    with _db_pool_lock:
+        if _db_pool is None or _db_pool_pid != os.getpid():
+            _db_pool = pooling.MySQLConnectionPool(
+                pool_name=f"atu_stack_{os.getpid()}",
+                pool_size=DB_POOL_SIZE,
+                **DB_CONFIG
+            )
+            _db_pool_pid = os.getpid()
+        return _db_pool
+
+def get_db_connection():
+    try:
+        return get_db_pool().get_connection()
+    except pooling.PoolError:
+        # Pool exhausted (e.g. threaded workers) - fall back to a plain connection
+        return mysql.connector.connect(**DB_CONFIG)
+
+# MySQL connection per request (borrowed from the pool, close() hands it back)
 @app.before_request
 def before_request():
-    g.db = mysql.connector.connect(
-        host=os.getenv('MYSQL_HOST'),
-        user=os.getenv('MYSQL_USER'),
-        password=os.getenv('MYSQL_PWD'),
-        database=os.getenv('MYSQL_SCHEMA'),
-        autocommit=True     # mysql.connector py library will open connections with autocommit OFF by default
-    )
+    g.db = get_db_connection()
 
 @app.teardown_request
 def teardown_request(exception):
@@ -37,6 +70,63 @@ def teardown_request(exception):
 def get_cursor():
     return g.db.cursor(dictionary=True)
 
+# Static catalogue caches.
+# The resources and tasks tables are seeded by DB/schema.sql and never change
+# while the game runs, so each process reads them once and keeps them in memory.
+_resource_catalogue = None
+_task_catalogue = None
+
+def get_resource_catalogue():
+    global _resource_catalogue
+    if _resource_catalogue is None:
+        cursor = get_cursor()
+        try:
+            cursor.execute("SELECT resource_id, name FROM resources")
+            _resource_catalogue = cursor.fetchall()
+        finally:
+            cursor.close()
+    return _resource_catalogue
+
+def get_task_catalogue():
+    global _task_catalogue
+    if _task_catalogue is None:
+        cursor = get_cursor()
+        try:
+            cursor.execute("SELECT * FROM tasks")
+            _task_catalogue = cursor.fetchall()
+        finally:
+            cursor.close()
+    return _task_catalogue
+
+def get_task(task_id):
+    for task in get_task_catalogue():
+        if task['task_id'] == task_id:
+            return task
+    return None
+
+def warm_up(prime_pool=True):
+    """Pay the first-request costs up front: imports, templates, catalogues, DB pool.
+
+    Safe to call more than once. With prime_pool=False no pooled connections are
+    opened, which is what the gunicorn master should use before forking workers.
+    """
+    import bcrypt  # noqa: F401
+
+    # Compile every template under templates/ into the Jinja cache
+    for name in app.jinja_env.list_templates():
+        app.jinja_env.get_template(name)
+
+    with app.app_context():
+        if prime_pool:
+            g.db = get_db_connection()
+        else:
+            g.db = mysql.connector.connect(**DB_CONFIG)
+        try:
+            get_resource_catalogue()
+            get_task_catalogue()
+        finally:
+            g.db.close()
+
 @app.before_request
 def inject_pending_trade_count():
     if current_user.is_authenticated:
@@ -130,6 +220,8 @@ def index():
 @app.route('/login', methods=['GET', 'POST'])
 def login():
     if request.method == 'POST':
+        import bcrypt
+
         username = request.form['username']
         password = request.form['password']
 
@@ -313,8 +405,7 @@ def perform_collect():
             flash("😵 Oh no! Hangover. Your resources were halved.", "danger")
         else:
             # Pick random resoource
-            cursor.execute("SELECT resource_id, name FROM resources")
-            resources = cursor.fetchall()
+            resources = get_resource_catalogue()
             chosen = random.choice(resources)
             res_id = chosen['resource_id']
             res_name = chosen['name']
@@ -367,8 +458,7 @@ def submit_task_page():
     cursor = get_cursor()
     try:
         # Get all tasks
-        cursor.execute("SELECT * FROM tasks")
-        tasks = cursor.fetchall()
+        tasks = get_task_catalogue()
 
         # Get player's current resources
         cursor.execute("""
@@ -391,8 +481,7 @@ def perform_submit_task():
     cursor = get_cursor()
     try:
         # Get task costs and reward
-        cursor.execute("SELECT * FROM tasks WHERE task_id = %s", (task_id,))
-        task = cursor.fetchone()
+        task = get_task(task_id)
 
         if not task:
             flash("❌ Invalid task selected.", "danger")
@@ -499,8 +588,7 @@ def trade():
         """, (player_id,))
         other_players = cursor.fetchall()
 
-        cursor.execute("SELECT resource_id, name FROM resources")
-        resources = cursor.fetchall()
+        resources = get_resource_catalogue()
 
         player_resources = get_player_resources(player_id)
 
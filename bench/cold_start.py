@@ -0,0 +1,128 @@
+"""Cold-start benchmark.
+
+Starts the app under gunicorn, measures the time until the first 200 OK, logs
+in, then records the latency of the next requests to an authenticated page to
+show how quickly workers settle.
+
+    python bench/cold_start.py --username jbloggs --password ...    # warmed up (default)
+    python bench/cold_start.py --username jbloggs --password ... --cold
+    python bench/cold_start.py --cookie <session cookie> --path /actions/trade
+    python bench/cold_start.py --path /login                        # anonymous page
+
+--cold turns off both the master preload and the per-worker warm-up
+(GUNICORN_PRELOAD=0, GUNICORN_WARMUP=0), giving the baseline to compare with.
+Needs the same .env / MySQL database as the app itself.
+"""
+import argparse
+import http.cookiejar
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def fetch(opener, url, data=None):
+    start = time.perf_counter()
+    with opener.open(url, data=data, timeout=30) as resp:
+        resp.read()
+        status, final_url = resp.status, resp.url
+    return status, final_url, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--path', default='/dashboard', help='page to request (default: /dashboard)')
+    parser.add_argument('--username', help='player to log in as')
+    parser.add_argument('--password')
+    parser.add_argument('--cookie', help='value of an existing Flask "session" cookie, instead of logging in')
+    parser.add_argument('--cold', action='store_true', help='no preload and no warm-up (baseline)')
+    parser.add_argument('--requests', type=int, default=100, help='requests after the first 200 OK')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--timeout', type=float, default=60, help='seconds to wait for the first 200 OK')
+    args = parser.parse_args()
+
+    if args.path != '/login' and not args.cookie and not (args.username and args.password):
+        parser.error(f'{args.path} needs --username/--password or --cookie')
+
+    port = free_port()
+    base = f'http://127.0.0.1:{port}'
+    env = dict(os.environ, GUNICORN_BIND=f'127.0.0.1:{port}', GUNICORN_WORKERS=str(args.workers))
+    if args.cold:
+        env.update(GUNICORN_PRELOAD='0', GUNICORN_WARMUP='0')
+
+    if args.cookie:
+        # Send the given session as-is; no cookie jar, so it is never replaced
+        opener = urllib.request.build_opener()
+        opener.addheaders = [('Cookie', f'session={args.cookie}')]
+    else:
+        opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()))
+
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'wsgi:app'],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        # Time to first 200 OK
+        while True:
+            if server.poll() is not None:
+                sys.exit(f'gunicorn exited with code {server.returncode}')
+            if time.perf_counter() - started > args.timeout:
+                sys.exit(f'no 200 OK from {base}/login within {args.timeout}s')
+            try:
+                status, _, _ = fetch(opener, base + '/login')
+                if status == 200:
+                    break
+            except (urllib.error.URLError, ConnectionError):
+                pass
+            time.sleep(0.01)
+        first_ok = time.perf_counter() - started
+
+        # First login pays for bcrypt and the dashboard render
+        login_ms = None
+        if args.username and not args.cookie:
+            form = urllib.parse.urlencode({'username': args.username, 'password': args.password}).encode()
+            _, final_url, elapsed = fetch(opener, base + '/login', form)
+            if not final_url.endswith('/dashboard'):
+                sys.exit(f'login as {args.username} failed')
+            login_ms = elapsed * 1000
+
+        # Latency curve for the following requests
+        latencies = []
+        for _ in range(args.requests):
+            _, final_url, elapsed = fetch(opener, base + args.path)
+            if args.path != '/login' and final_url.endswith('/login'):
+                sys.exit(f'{args.path} redirected to /login - session not accepted')
+            latencies.append(elapsed * 1000)
+    finally:
+        server.terminate()
+        server.wait()
+
+    print(f'mode:                 {"cold (no preload, no warm-up)" if args.cold else "preload + warm-up"}')
+    print(f'time to first 200 OK: {first_ok * 1000:.0f} ms')
+    if login_ms is not None:
+        print(f'first login:          {login_ms:.0f} ms')
+    print(f'first {args.requests} requests to {args.path}: median {statistics.median(latencies):.1f} ms, '
+          f'max {max(latencies):.1f} ms')
+    print('requests    min ms  median ms   max ms')
+    step = 10
+    for i in range(0, len(latencies), step):
+        chunk = latencies[i:i + step]
+        print(f'{i + 1:>4}-{i + len(chunk):<4} {min(chunk):>9.1f} {statistics.median(chunk):>10.1f} {max(chunk):>8.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,283 @@
+"""Fixtures for the route benchmark suite.
+
+Every scale gets its own throwaway database, built from DB/schema.sql on the
+MySQL server named by BENCH_MYSQL_HOST / BENCH_MYSQL_USER / BENCH_MYSQL_PWD,
+seeded with synthetic players and dropped again afterwards. The MySQL user needs
+rights to create databases and triggers. Without BENCH_MYSQL_HOST the suite is
+skipped.
+"""
+import json
+import math
+import os
+import random
+import re
+
+import bcrypt
+import mysql.connector
+import pytest
+
+import app as stack_app
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCHEMA_PATH = os.path.join(ROOT, 'DB', 'schema.sql')
+SCHEMA_NAME = 'atu_stack_prod'
+BUDGETS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'budgets.json')
+
+# BENCH_WRITE_BUDGETS=1 rewrites the wall-time budgets from this run: the
+# measured median times MS_MARGIN, rounded up to the next MS_ROUND ms
+WRITE_BUDGETS = os.getenv('BENCH_WRITE_BUDGETS') == '1'
+MS_MARGIN = 2
+MS_ROUND = 5
+
+# Number of synthetic players per scale
+SCALES = {
+    'class': 30,
+    'cohort': 300,
+    'campus': 3000,
+}
+HISTORY_PER_PLAYER = 20
+COLLECTS_PER_PLAYER = 5
+TRADES_PER_PLAYER = 5
+
+# Seeded players the benchmarks act as (ids are looked up after seeding, since
+# auto_increment_increment is not 1 on every server)
+PLAYER_USERNAME = 'bench00001'
+PLAYER_PASSWORD = 'bench-password'
+PARTNER_USERNAME = 'bench00002'
+ADMIN_USERNAME = 'benchadmin'
+
+# (route, scale) -> {'queries': int, 'ms': float}, printed at the end of the run
+RESULTS = {}
+
+
+def schema_statements(db_name):
+    """Split DB/schema.sql into statements, honouring DELIMITER and renaming the database."""
+    statements = []
+    delimiter = ';'
+    lines = []
+    with open(SCHEMA_PATH, encoding='utf-8') as f:
+        for line in f:
+            line = re.sub(r'(^|\s)--(\s.*)?$', '', line.rstrip('\n'))
+            line = line.replace(SCHEMA_NAME, db_name)
+            stripped = line.strip()
+            if not stripped:
+                continue
+            if stripped.upper().startswith('DELIMITER'):
+                delimiter = stripped.split()[1]
+                continue
+            lines.append(line)
+            if stripped.endswith(delimiter):
+                sql = '\n'.join(lines).strip()
+                # Also drop the ';' ending a trigger body, so each statement is sent alone
+                statements.append(sql[:-len(delimiter)].strip().rstrip(';'))
+                lines = []
+    return statements
+
+
+class BenchDB:
+    """A throwaway copy of the game database, plus helpers to set up route calls."""
+
+    def __init__(self, scale, players):
+        self.scale = scale
+        self.players = players
+        self.name = f'atu_stack_bench_{scale}_{os.getpid()}'
+        self.config = {
+            'host': os.environ['BENCH_MYSQL_HOST'],
+            'user': os.getenv('BENCH_MYSQL_USER', 'root'),
+            'password': os.getenv('BENCH_MYSQL_PWD', ''),
+        }
+        self.player_id = None
+        self.partner_id = None
+        self.admin_id = None
+        self.player_username = PLAYER_USERNAME
+        self.player_password = PLAYER_PASSWORD
+        self.cnx = mysql.connector.connect(autocommit=True, **self.config)
+
+    def create(self):
+        cursor = self.cnx.cursor()
+        try:
+            for sql in schema_statements(self.name):
+                cursor.execute(sql)
+        finally:
+            cursor.close()
+        self.cnx.database = self.name
+        self.seed()
+        self.player_id = self.player_id_for(PLAYER_USERNAME)
+        self.partner_id = self.player_id_for(PARTNER_USERNAME)
+        self.admin_id = self.player_id_for(ADMIN_USERNAME)
+
+    def seed(self):
+        rng = random.Random(self.players)
+        cursor = self.cnx.cursor()
+        try:
+            cursor.executemany("""
+                INSERT INTO players (firstname, lastname, username, password_hash, credits)
+                VALUES (%s, %s, %s, %s, %s)
+            """, [('Bench', f'Player{i:05d}', f'bench{i:05d}', 'x', rng.randint(0, 200))
+                  for i in range(1, self.players + 1)])
+
+            # One real bcrypt hash, so POST /login pays for the password check
+            password_hash = bcrypt.hashpw(PLAYER_PASSWORD.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+            cursor.execute("UPDATE players SET password_hash = %s WHERE username = %s",
+                           (password_hash, PLAYER_USERNAME))
+            cursor.execute("""
+                INSERT INTO players (firstname, lastname, username, password_hash, is_admin)
+                VALUES ('Bench', 'Admin', %s, 'x', TRUE)
+            """, (ADMIN_USERNAME,))
+
+            # Enough of everything that tasks and trades never run out mid-benchmark
+            cursor.execute("UPDATE player_resources SET quantity = 1000000")
+
+            cursor.execute("SELECT player_id FROM players ORDER BY player_id")
+            ids = [row[0] for row in cursor.fetchall()]
+            cursor.executemany("""
+                INSERT INTO player_history (player_id, action_type, description, credits_earned, timestamp)
+                VALUES (%s, 'collect', '5x pizza 🍕', 0, NOW() - INTERVAL %s MINUTE)
+            """, [(pid, n) for pid in ids for n in range(1, HISTORY_PER_PLAYER + 1)])
+
+            cursor.executemany("""
+                INSERT INTO collect_log (player_id, collect_num, timestamp)
+                VALUES (%s, %s, NOW() - INTERVAL 1 HOUR)
+            """, [(pid, n) for pid in ids for n in range(1, COLLECTS_PER_PLAYER + 1)])
+
+            trades = []
+            for pid in ids:
+                for _ in range(TRADES_PER_PLAYER):
+                    recipient = rng.choice(ids)
+                    status = rng.choice(['pending', 'completed', 'cancelled'])
+                    trades.append((pid, recipient, rng.randint(1, 4), rng.randint(1, 4), status))
+            cursor.executemany("""
+                INSERT INTO trades (initiator_id, recipient_id, offered_resource_id, offered_quantity,
+                                    requested_resource_id, requested_quantity, status)
+                VALUES (%s, %s, %s, 1, %s, 1, %s)
+            """, trades)
+        finally:
+            cursor.close()
+
+    def player_id_for(self, username):
+        cursor = self.cnx.cursor()
+        try:
+            cursor.execute("SELECT player_id FROM players WHERE username = %s", (username,))
+            return cursor.fetchone()[0]
+        finally:
+            cursor.close()
+
+    def new_trade(self):
+        """Pending trade from the partner to the benchmark player; returns its id."""
+        cursor = self.cnx.cursor()
+        try:
+            cursor.execute("""
+                INSERT INTO trades (initiator_id, recipient_id, offered_resource_id, offered_quantity,
+                                    requested_resource_id, requested_quantity)
+                VALUES (%s, %s, 1, 1, 2, 1)
+            """, (self.partner_id, self.player_id))
+            return cursor.lastrowid
+        finally:
+            cursor.close()
+
+    def latest_pending_trade(self, initiator_id, recipient_id):
+        """Id of the newest pending trade between the two players, or 0."""
+        cursor = self.cnx.cursor()
+        try:
+            cursor.execute("""
+                SELECT COALESCE(MAX(trade_id), 0) FROM trades
+                WHERE initiator_id = %s AND recipient_id = %s AND status = 'pending'
+            """, (initiator_id, recipient_id))
+            return cursor.fetchone()[0]
+        finally:
+            cursor.close()
+
+    def trade_status(self, trade_id):
+        cursor = self.cnx.cursor()
+        try:
+            cursor.execute("SELECT status FROM trades WHERE trade_id = %s", (trade_id,))
+            return cursor.fetchone()[0]
+        finally:
+            cursor.close()
+
+    def drop(self):
+        cursor = self.cnx.cursor()
+        try:
+            cursor.execute(f"DROP DATABASE IF EXISTS `{self.name}`")
+        finally:
+            cursor.close()
+            self.cnx.close()
+
+
+@pytest.fixture(scope='session', params=list(SCALES))
+def bench_db(request):
+    if not os.getenv('BENCH_MYSQL_HOST'):
+        pytest.skip('BENCH_MYSQL_HOST not set - no MySQL server for benchmarks')
+
+    db = BenchDB(request.param, SCALES[request.param])
+    with pytest.MonkeyPatch.context() as mp:
+        try:
+            db.create()
+
+            # Point the app (and a fresh pool and catalogue cache) at the throwaway
+            # database; everything is restored when the context exits
+            for key, value in dict(db.config, database=db.name).items():
+                mp.setitem(stack_app.DB_CONFIG, key, value)
+            mp.setattr(stack_app, '_db_pool', None)
+            mp.setattr(stack_app, '_resource_catalogue', None)
+            mp.setattr(stack_app, '_task_catalogue', None)
+            mp.setitem(stack_app.app.config, 'TESTING', True)
+            mp.setattr(stack_app.app, 'secret_key', stack_app.app.secret_key or 'bench')
+            stack_app.warm_up()
+
+            yield db
+        finally:
+            # Close the pooled connections before their database is dropped
+            if stack_app._db_pool is not None:
+                stack_app._db_pool._remove_connections()
+            db.drop()
+
+
+@pytest.fixture
+def make_client(bench_db):
+    """Returns a function giving a fresh test client for 'player', 'admin' or None (anonymous)."""
+    def make(user):
+        client = stack_app.app.test_client()
+        if user:
+            with client.session_transaction() as session:
+                session['_user_id'] = str(bench_db.admin_id if user == 'admin' else bench_db.player_id)
+                session['_fresh'] = True
+        return client
+    return make
+
+
+@pytest.fixture
+def record_result(bench_db):
+    def record(route, queries, ms):
+        RESULTS[(route, bench_db.scale)] = {'queries': queries, 'ms': ms}
+    return record
+
+
+def write_budgets(budgets):
+    """Write budgets.json with one route per line, so diffs stay readable."""
+    lines = [f'  {json.dumps(route) + ":":<23}{json.dumps(budget)}' for route, budget in budgets.items()]
+    with open(BUDGETS_PATH, 'w', encoding='utf-8') as f:
+        f.write('{\n' + ',\n'.join(lines) + '\n}\n')
+
+
+def pytest_sessionfinish(session):
+    if not WRITE_BUDGETS or not RESULTS:
+        return
+    with open(BUDGETS_PATH, encoding='utf-8') as f:
+        budgets = json.load(f)
+    for (route, scale), result in RESULTS.items():
+        ms = math.ceil(result['ms'] * MS_MARGIN / MS_ROUND) * MS_ROUND
+        budgets[route].setdefault('ms', {})[scale] = ms
+    for budget in budgets.values():
+        if 'ms' in budget:
+            budget['ms'] = {scale: budget['ms'][scale] for scale in SCALES if scale in budget['ms']}
+    write_budgets(budgets)
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not RESULTS:
+        return
+    terminalreporter.section('route benchmarks')
+    terminalreporter.write_line(f"{'route':<22}{'scale':<10}{'queries':>8}{'median ms':>12}")
+    for (route, scale), result in sorted(RESULTS.items()):
+        terminalreporter.write_line(f"{route:<22}{scale:<10}{result['queries']:>8}{result['ms']:>12.1f}")
@@ -0,0 +1,146 @@
+"""Per-route latency budgets.
+
+Each route is called REPEAT times against every scale in conftest.SCALES. The
+test fails when the route runs more SQL statements, or takes longer (median wall
+time), than its budget in budgets.json. Query budgets are the same at every
+scale - a count that grows with the data is an N+1 bug. Time budgets are
+measured, not chosen: run with BENCH_WRITE_BUDGETS=1 to set them (see conftest).
+"""
+import json
+import os
+import statistics
+import time
+from urllib.parse import urlparse
+
+import pytest
+
+import app as stack_app
+
+REPEAT = 5
+
+with open(os.path.join(os.path.dirname(__file__), 'budgets.json'), encoding='utf-8') as f:
+    BUDGETS = json.load(f)
+
+
+def case(method, path, data=None, user='player', status=200, location=None, check=None):
+    """One call to a route, and what a successful call looks like.
+
+    user is 'player', 'admin' or None (anonymous); location is the redirect
+    target (path and query) of a successful call; check is an optional callable
+    returning True once the call has had its effect in the database.
+    """
+    return {'method': method, 'path': path, 'data': data, 'user': user,
+            'status': status, 'location': location, 'check': check}
+
+
+def accept_trade(db):
+    trade_id = db.new_trade()
+    return case('POST', f'/actions/accept_trade/{trade_id}', status=302, location='/actions/trade',
+                check=lambda: db.trade_status(trade_id) == 'completed')
+
+
+def create_trade(db):
+    before = db.latest_pending_trade(db.player_id, db.partner_id)
+    return case('POST', '/actions/trade', {
+        'recipient_id': db.partner_id,
+        'offered_resource_id': 1,
+        'requested_resource_id': 2,
+        'offered_quantity': 1,
+        'requested_quantity': 1,
+    }, status=302, location='/actions/trade',
+        check=lambda: db.latest_pending_trade(db.player_id, db.partner_id) > before)
+
+
+def reject_trade(db):
+    trade_id = db.new_trade()
+    return case('POST', f'/actions/reject_trade/{trade_id}', status=302, location='/actions/trade',
+                check=lambda: db.trade_status(trade_id) == 'cancelled')
+
+
+# route -> function(db) returning a case()
+ROUTES = {
+    'index': lambda db: case('GET', '/', user=None),
+    'login': lambda db: case('GET', '/login', user=None),
+    'login_submit': lambda db: case('POST', '/login', {
+        'username': db.player_username,
+        'password': db.player_password,
+    }, user=None, status=302, location='/dashboard'),
+    'logout': lambda db: case('GET', '/logout', status=302, location='/login'),
+    'dashboard': lambda db: case('GET', '/dashboard'),
+    'admin_panel': lambda db: case('GET', '/admin', user='admin'),
+    # An empty form unpauses everything, so the other routes keep working
+    'update_settings': lambda db: case('POST', '/admin', {}, user='admin', status=302, location='/admin'),
+    'actions': lambda db: case('GET', '/actions'),
+    'show_collect_page': lambda db: case('GET', '/actions/collect'),
+    'perform_collect': lambda db: case('POST', '/actions/collect/confirm', status=302, location='/dashboard'),
+    'submit_task_page': lambda db: case('GET', '/actions/tasks'),
+    'perform_submit_task': lambda db: case('POST', '/actions/tasks', {'task_id': 3},
+                                           status=302, location='/dashboard'),
+    'trade': lambda db: case('GET', '/actions/trade'),
+    'create_trade': create_trade,
+    'accept_trade': accept_trade,
+    'reject_trade': reject_trade,
+    'leaderboard': lambda db: case('GET', '/actions/leaderboard'),
+}
+
+
+class CountingCursor:
+    """Cursor wrapper that records every statement it runs."""
+
+    def __init__(self, cursor, statements):
+        self._cursor = cursor
+        self._statements = statements
+
+    def execute(self, operation, *args, **kwargs):
+        self._statements.append(operation)
+        return self._cursor.execute(operation, *args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+@pytest.mark.parametrize('route', list(ROUTES))
+def test_route_within_budget(route, bench_db, make_client, record_result, monkeypatch):
+    statements = []
+    get_cursor = stack_app.get_cursor
+    monkeypatch.setattr(stack_app, 'get_cursor', lambda: CountingCursor(get_cursor(), statements))
+
+    counts = []
+    timings = []
+    for _ in range(REPEAT):
+        # Setup (e.g. creating the trade to accept) happens before the clock starts
+        call = ROUTES[route](bench_db)
+        c = make_client(call['user'])
+        statements.clear()
+
+        start = time.perf_counter()
+        response = c.open(call['path'], method=call['method'], data=call['data'])
+        timings.append((time.perf_counter() - start) * 1000)
+
+        # An early exit (login redirect, paused game, failed trade...) runs fewer
+        # queries, so it must fail here rather than pass the budget
+        assert response.status_code == call['status'], (
+            f'{route} returned {response.status_code}, expected {call["status"]} '
+            f'(location: {response.location})')
+        if call['location']:
+            # Compare the query too: a login_required redirect is /login?next=...
+            url = urlparse(response.location)
+            target = url.path + (f'?{url.query}' if url.query else '')
+            assert target == call['location'], (
+                f'{route} redirected to {response.location}, expected {call["location"]}')
+        if call['check']:
+            assert call['check'](), f'{route} did not update the database'
+        counts.append(len(statements))
+
+    queries = max(counts)
+    ms = statistics.median(timings)
+    record_result(route, queries, ms)
+
+    budget = BUDGETS[route]
+    assert queries <= budget['queries'], (
+        f'{route} ran {queries} queries, budget is {budget["queries"]}')
+    # Routes without a measured time budget (or a calibration run) only check queries
+    ms_budget = budget.get('ms', {}).get(bench_db.scale)
+    if ms_budget is not None and os.getenv('BENCH_WRITE_BUDGETS') != '1':
+        assert ms <= ms_budget, (
+            f'{route} took {ms:.1f} ms at {bench_db.scale} scale, budget is {ms_budget} ms')
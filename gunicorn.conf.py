@@ -0,0 +1,50 @@
+# Gunicorn settings for lecture use:  gunicorn wsgi:app
+# Set GUNICORN_PRELOAD=0 to start workers without preloading app.py, and
+# GUNICORN_WARMUP=0 to skip warm-up entirely (the cold-start baseline).
+import os
+
+from dotenv import load_dotenv
+
+# Read .env here as well as in app.py, so a MYSQL_POOL_SIZE set there wins over
+# the per-thread default below (load_dotenv never overrides existing variables)
+load_dotenv()
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.getenv('GUNICORN_WORKERS', '4'))
+threads = int(os.getenv('GUNICORN_THREADS', '1'))
+
+# One pooled MySQL connection per worker thread (app.py caps this at 32)
+os.environ.setdefault('MYSQL_POOL_SIZE', str(threads))
+
+# Import app.py once in the master and fork workers from it, so every worker
+# starts with modules imported and templates compiled.
+preload_app = os.getenv('GUNICORN_PRELOAD', '1') == '1'
+
+# Not a gunicorn setting: whether the hooks below warm up the master and workers
+WARMUP = os.getenv('GUNICORN_WARMUP', '1') == '1'
+
+
+def when_ready(server):
+    # Runs in the master after a preloaded app is imported, before any fork.
+    # No pooled connections here - sockets must not be shared with workers.
+    if WARMUP and server.cfg.preload_app:
+        from app import warm_up
+        try:
+            warm_up(prime_pool=False)
+        except Exception as e:
+            # Best-effort: the workers still boot and connect on their first request
+            server.log.warning("Warm-up skipped in master: %s", e)
+
+
+def post_fork(server, worker):
+    # Runs in each new worker (including ones recycled mid-lecture) before it
+    # accepts requests: open this worker's own connection pool.
+    if not WARMUP:
+        return
+    from app import warm_up
+    try:
+        warm_up()
+    except Exception as e:
+        # A DB outage must not stop the worker booting (gunicorn would halt the
+        # whole server); it connects lazily on its first request instead.
+        server.log.warning("Warm-up skipped in worker %s: %s", worker.pid, e)